@@ -5,6 +5,7 @@ Provides database() async context manager for application lifecycle.
 Uses aiosqlite for async access and dataclass conversion at the boundary.
 """
 
+import asyncio
 import dataclasses
 import sqlite3
 from collections.abc import Awaitable, Callable
@@ -27,7 +28,10 @@ def columns(cls: type) -> tuple[str, ...]:
 
 # Module-level connection, set by database() context manager
 _conn: aiosqlite.Connection | None = None
-_in_transaction: bool = False
+# Serializes writes on the shared connection; db.transaction() holds it for its whole block
+_write_lock: asyncio.Lock | None = None
+# Task inside the open db.transaction(); only its writes join the transaction
+_tx_owner: asyncio.Task | None = None
 
 # Migration functions are applied in order. Append new entries to add a migration.
 # Each migration runs inside db.transaction() and bumps PRAGMA user_version on success.
@@ -86,6 +90,8 @@ CREATE TABLE IF NOT EXISTS history_change (
     regress_pixels INTEGER NOT NULL DEFAULT 0
 );
 
+CREATE INDEX IF NOT EXISTS idx_history_change_project_timestamp ON history_change(project_id, timestamp);
+
 CREATE TABLE IF NOT EXISTS tile (
     id INTEGER PRIMARY KEY,
     x INTEGER NOT NULL,
@@ -139,15 +145,15 @@ async def database(db_path: str | None = None):
             # ... use query helpers ...
         # Connection automatically closed
     """
-    global _conn, _in_transaction
+    global _conn, _write_lock, _tx_owner
     if db_path is None:
         db_path = str(get_config().data_dir / "pixel-hawk.db")
-    prior_conn = _conn
-    prior_tx = _in_transaction
+    prior = _conn, _write_lock, _tx_owner
     conn = await aiosqlite.connect(db_path)
     conn.row_factory = sqlite3.Row
     _conn = conn
-    _in_transaction = False
+    _write_lock = asyncio.Lock()
+    _tx_owner = None
     try:
         await conn.execute("PRAGMA journal_mode=WAL")
         await conn.execute("PRAGMA foreign_keys=ON")
@@ -158,19 +164,22 @@ async def database(db_path: str | None = None):
         yield
     finally:
         await conn.close()
-        _conn = prior_conn
-        _in_transaction = prior_tx
+        _conn, _write_lock, _tx_owner = prior
 
 
 async def execute(sql: str, params: tuple = ()) -> aiosqlite.Cursor:
     """Execute a write query (INSERT, UPDATE, DELETE).
 
-    Auto-commits unless running inside a db.transaction() block, in which case
-    the enclosing transaction controls the commit/rollback boundary.
+    Auto-commits unless the calling task is inside a db.transaction() block, in which
+    case the enclosing transaction controls the commit/rollback boundary. Writes from
+    other tasks wait for that transaction to finish instead of landing inside it.
     """
     conn = get_conn()
-    cursor = await conn.execute(sql, params)
-    if not _in_transaction:
+    if _tx_owner is not None and _tx_owner is asyncio.current_task():
+        return await conn.execute(sql, params)
+    assert _write_lock is not None
+    async with _write_lock:
+        cursor = await conn.execute(sql, params)
         await conn.commit()
     return cursor
 
@@ -182,26 +191,33 @@ async def transaction():
     Issues BEGIN IMMEDIATE on entry, COMMIT on clean exit, ROLLBACK on exception.
     While active, db.execute() skips its own commit so all statements land atomically.
 
-    Nest-safe: a transaction() nested inside another is a no-op — SQLite does not
-    support true nested transactions without savepoints, and we don't need those
-    semantics here. The outermost transaction() controls the boundary.
+    Nest-safe: a transaction() nested inside another in the same task is a no-op —
+    SQLite does not support true nested transactions without savepoints, and we don't
+    need those semantics here. The outermost transaction() controls the boundary.
+
+    The connection is shared by every task, so the block holds the write lock: other
+    tasks' db.execute() and transaction() calls wait until it commits or rolls back.
+    Don't spawn tasks that write from inside the block; they would wait on it forever.
     """
-    global _in_transaction
+    global _tx_owner
     conn = get_conn()
-    if _in_transaction:
+    task = asyncio.current_task()
+    if _tx_owner is not None and _tx_owner is task:
         yield
         return
-    await conn.execute("BEGIN IMMEDIATE")
-    _in_transaction = True
-    try:
-        yield
-    except BaseException:
-        await conn.rollback()
-        raise
-    else:
-        await conn.commit()
-    finally:
-        _in_transaction = False
+    assert _write_lock is not None
+    async with _write_lock:
+        await conn.execute("BEGIN IMMEDIATE")
+        _tx_owner = task
+        try:
+            yield
+        except BaseException:
+            await conn.rollback()
+            raise
+        else:
+            await conn.commit()
+        finally:
+            _tx_owner = None
 
 
 async def execute_insert(sql: str, params: tuple = ()) -> int:
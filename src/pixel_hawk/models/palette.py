@@ -103,7 +103,7 @@ class Palette:
             raise ColorsNotInPalette(colors_not_in_palette)
         # Input image now closed, create new paletted image
         image = self.new(size)
-        image.putdata(data)
+        image.frombytes(data)
         return image  # Return new image (caller must close)
 
     def lookup(self, colors_not_in_palette: dict[int, int], rgba: RGBATuple) -> int:
@@ -122,9 +122,9 @@ class Palette:
         colors_not_in_palette[rgb] = colors_not_in_palette.get(rgb, 0) + 1
         return 0
 
-    def new(self, size: tuple[int, int]) -> Image.Image:
-        """Create a new image with this palette and given size."""
-        image = Image.new("P", size)
+    def new(self, size: tuple[int, int], fill: int = 0) -> Image.Image:
+        """Create a new image with this palette and given size, every pixel set to palette index `fill`."""
+        image = Image.new("P", size, fill)
         image.putpalette(self._raw)
         image.info["transparency"] = 0
         return image
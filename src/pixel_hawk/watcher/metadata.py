@@ -16,36 +16,69 @@ if TYPE_CHECKING:
     from ..models.project import ProjectInfo
 
 
+# Pixel comparisons run on whole buffers instead of per-pixel Python loops: each image is
+# translated into a mask holding one 0/1 byte per pixel, the masks are combined as big ints
+# with bitwise operators, and int.bit_count() counts the pixels that are set.
+_IS_ZERO = bytes([1]) + bytes(255)
+_IS_NONZERO = bytes([0]) + bytes([1]) * 255
+
+
+def _mask(data: bytes, table: bytes) -> int:
+    return int.from_bytes(data.translate(table))
+
+
+def _opaque_mask(target_data: bytes) -> int:
+    """Mask of the pixels that are part of the project (non-transparent in the target)."""
+    return _mask(target_data, _IS_NONZERO)
+
+
+def _equal_mask(data: bytes, target_data: bytes) -> int:
+    """Mask of the pixels where both equal-length buffers hold the same palette index."""
+    xor = int.from_bytes(data) ^ int.from_bytes(target_data)
+    return _mask(xor.to_bytes(len(data)), _IS_ZERO)
+
+
+def _split_changes(was_correct: int, is_correct: int) -> tuple[int, int]:
+    """Return (regressed, progressed) masks from the previous and current correct-pixel masks."""
+    still_correct = was_correct & is_correct
+    return was_correct ^ still_correct, is_correct ^ still_correct
+
+
+def _regress_progress_masks(current_data: bytes, prev_data: bytes, target_data: bytes) -> tuple[int, int, int]:
+    """Return (regressed, progressed, length) masks over the common prefix of the three buffers."""
+    n = min(len(current_data), len(prev_data), len(target_data))
+    target_data = target_data[:n]
+    opaque = _opaque_mask(target_data)
+    was_correct = opaque & _equal_mask(prev_data[:n], target_data)
+    is_correct = opaque & _equal_mask(current_data[:n], target_data)
+    return *_split_changes(was_correct, is_correct), n
+
+
 def find_regressed_indices(current_data: bytes, prev_data: bytes, target_data: bytes) -> list[int]:
     """Return flat array indices of all regressed pixels.
 
     A pixel is regressed when it was correct in the previous snapshot but is now wrong.
     """
-    return [
-        i
-        for i, (curr_px, prev_px, target_px) in enumerate(zip(current_data, prev_data, target_data))
-        if target_px != 0 and prev_px == target_px and curr_px != target_px
-    ]
+    regressed, _, n = _regress_progress_masks(current_data, prev_data, target_data)
+    flags = regressed.to_bytes(n)
+    indices = []
+    i = flags.find(1)
+    while i != -1:
+        indices.append(i)
+        i = flags.find(1, i + 1)
+    return indices
 
 
 def compare_snapshots(current_data: bytes, prev_data: bytes, target_data: bytes) -> tuple[int, int]:
     """Compare current and previous snapshots to detect progress and regress.
 
+    Transparent target pixels are not part of the project and are skipped.
+
     Returns:
         Tuple of (progress_pixels, regress_pixels)
     """
-    progress_pixels = 0
-    regress_pixels = 0
-
-    for curr_px, prev_px, target_px in zip(current_data, prev_data, target_data):
-        if target_px == 0:  # Skip transparent pixels (not part of project)
-            continue
-        if prev_px != target_px and curr_px == target_px:
-            progress_pixels += 1
-        elif prev_px == target_px and curr_px != target_px:
-            regress_pixels += 1
-
-    return progress_pixels, regress_pixels
+    regressed, progressed, _ = _regress_progress_masks(current_data, prev_data, target_data)
+    return progressed.bit_count(), regressed.bit_count()
 
 
 def update_completion(info: ProjectInfo, num_remaining: int, percent_complete: float, timestamp: int) -> None:
@@ -99,13 +132,17 @@ def process_diff(info: ProjectInfo, current_data: bytes, target_data: bytes, pre
     info.last_check = timestamp = round(time.time())
 
     # Count target pixels
-    num_target = sum(1 for v in target_data if v) or 1  # avoid division by zero
+    num_target = (len(target_data) - target_data.count(0)) or 1  # avoid division by zero
 
     # Compare current vs target to find remaining pixels
-    remaining = bytes(0 if target == current else target for current, target in zip(current_data, target_data))
+    n = min(len(current_data), len(target_data))
+    compared_target = target_data[:n]
+    opaque = _opaque_mask(compared_target)
+    # A finished canvas matches the target byte for byte; a single memcmp then settles every pixel
+    correct = opaque if current_data == target_data else opaque & _equal_mask(current_data[:n], compared_target)
 
     # Check if project not started (all target pixels remain, and no previous snapshot)
-    if not prev_data and remaining == target_data:
+    if not prev_data and not correct:
         info.last_log_message = f"{owner.name}/{info.name}: Not started"
         return HistoryChange(
             project=info,
@@ -120,15 +157,22 @@ def process_diff(info: ProjectInfo, current_data: bytes, target_data: bytes, pre
         )
 
     # Count remaining pixels and calculate completion
-    num_remaining = sum(1 for v in remaining if v)
+    num_remaining = opaque.bit_count() - correct.bit_count()
     percent_complete = 100.0 - (num_remaining * 100.0 / num_target)
 
     # Compare with previous snapshot to detect progress/regress
     progress_pixels = 0
     regress_pixels = 0
 
-    if prev_data:
-        progress_pixels, regress_pixels = compare_snapshots(current_data, prev_data, target_data)
+    # An unchanged canvas is settled by one memcmp: nothing can have progressed or regressed
+    if prev_data and prev_data != current_data:
+        if len(prev_data) >= n:
+            # Common case: reuse the opaque and current-correct masks, so only the snapshot needs a pass
+            was_correct = opaque & _equal_mask(prev_data[:n], compared_target)
+            regressed, progressed = _split_changes(was_correct, correct)
+            progress_pixels, regress_pixels = progressed.bit_count(), regressed.bit_count()
+        else:
+            progress_pixels, regress_pixels = compare_snapshots(current_data, prev_data, target_data)
 
     # Update totals
     info.total_progress += progress_pixels
@@ -141,7 +185,7 @@ def process_diff(info: ProjectInfo, current_data: bytes, target_data: bytes, pre
     update_regress(info, regress_pixels, timestamp)
 
     # Check for completion
-    if max(remaining) == 0:
+    if num_remaining == 0:
         info.last_log_message = (
             f"{owner.name}/{info.name}: Complete! {num_target} pixels total. {info.rectangle.to_link()}"
         )
@@ -46,6 +46,7 @@ class Project:
         self.info = info
         self.rect = info.rectangle
         self.path = get_config().projects_dir / str(info.owner.id) / info.filename
+        self._hash = hash(self.path)
         self.regressed_indices: list[int] = []
         self.grief_report: GriefReport = GriefReport()
         try:
@@ -91,7 +92,7 @@ class Project:
         return self.path == getattr(other, "path", ...)
 
     def __hash__(self):
-        return hash(self.path)
+        return self._hash
 
     @property
     def snapshot_path(self) -> Path:
@@ -167,17 +168,16 @@ class Project:
 
     def _has_missing_tiles(self) -> bool:
         """Check if any tiles required by this project are missing from cache."""
-        for tile in self.rect.tiles:
-            tile_path = get_config().tiles_dir / f"tile-{tile}.png"
-            if not tile_path.exists():
-                return True
-        return False
+        base_path = get_config().tiles_dir
+        return not all((base_path / f"tile-{tile}.png").exists() for tile in self.rect.tiles)
 
 
 def get_flattened_data(image: Image.Image) -> bytes:
-    target_flattened = image.get_flattened_data()
-    assert target_flattened is not None, "Image must have data"
-    return bytes(target_flattened)  # type: ignore[arg-type]
+    """Return the palette indices of a mode "P" image, one byte per pixel in row-major order.
+
+    tobytes() copies the raw buffer in one go; Image.get_flattened_data() would box every pixel in a tuple first.
+    """
+    return image.tobytes()
 
 
 async def count_cached_tiles(rect: Rectangle) -> tuple[int, int]:
@@ -5,6 +5,7 @@ import pixel_hawk.interface.commands
 import pixel_hawk.models.config
 from pixel_hawk.models.config import Config
 from pixel_hawk.models.db import database
+from pixel_hawk.models.person import Person
 
 
 @pytest.fixture(autouse=True)
@@ -42,6 +43,18 @@ async def setup_db():
         yield
 
 
+@pytest.fixture
+async def test_person(setup_config):
+    """Create a test person in this test's database, along with their projects directory.
+
+    Function-scoped on purpose: setup_db gives every test its own in-memory
+    database, so a row created once per session would not exist in the next test.
+    """
+    person = await Person.create(name="TestPerson")
+    (setup_config.projects_dir / str(person.id)).mkdir()
+    return person
+
+
 @pytest.fixture(autouse=True)
 def disable_file_logging(monkeypatch):
     """Prevent logger.add() from creating file handlers during tests."""
@@ -4,6 +4,7 @@ import base64
 import json
 import time
 import uuid
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 
@@ -166,8 +167,9 @@ class TestListProjects:
 # Test image helpers
 
 
+@lru_cache(maxsize=16)
 def _make_test_png(width: int = 10, height: int = 10) -> bytes:
-    """Create a valid WPlace palette PNG as bytes."""
+    """Create a valid WPlace palette PNG as bytes. Cached, since most tests only need the same blank 10x10."""
     image = PALETTE.new((width, height))
     buf = BytesIO()
     image.save(buf, format="PNG")
@@ -780,7 +782,7 @@ class _FakeImage:
     async def __aexit__(self, *_):
         pass
 
-    def get_flattened_data(self):
+    def tobytes(self):
         return self._data
 
     def save(self, path):
@@ -793,8 +795,8 @@ class _FakeImage:
 def _patch_diff(monkeypatch, size=(10, 10), target_value=1, current_value=1):
     """Patch stitch_tiles and PALETTE.aopen_file so run_diff can execute."""
     n = size[0] * size[1]
-    target = _FakeImage(bytes([target_value] * n), size)
-    current = _FakeImage(bytes([current_value] * n), size)
+    target = _FakeImage(bytes([target_value]) * n, size)
+    current = _FakeImage(bytes([current_value]) * n, size)
 
     monkeypatch.setattr(PALETTE, "aopen_file", lambda path: target)
 
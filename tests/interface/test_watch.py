@@ -28,6 +28,7 @@ RECT = Rectangle.from_point_size(Point(500_000, 600_000), Size(100, 100))
 async def _person_and_project(*, state=ProjectState.ACTIVE) -> tuple[Person, ProjectInfo]:
     person = await Person.create(name="Watcher", discord_id=77777)
     info = await ProjectInfo.from_rect(RECT, person.id, "test project")
+    info.owner = person
     if state != ProjectState.ACTIVE:
         info.state = state
         await info.save()
@@ -42,14 +43,13 @@ class TestFormatWatchMessage:
         person = await Person.create(name="Bob", discord_id=10001)
         info = ProjectInfo(owner_id=person.id, name="wip", state=ProjectState.CREATING, width=50, height=50)
         await info.save_as_new()
-        await info.fetch_related_owner()
+        info.owner = person
         result = await format_watch_message(info)
         assert "CREATING" in result
         assert "wip" in result
 
     async def test_inactive_state(self):
         person, info = await _person_and_project(state=ProjectState.INACTIVE)
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "INACTIVE" in result
         assert "not being monitored" in result.lower()
@@ -58,7 +58,6 @@ class TestFormatWatchMessage:
         person, info = await _person_and_project()
         info.last_check = 0
         await info.save()
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "Not yet checked" in result
 
@@ -79,7 +78,6 @@ class TestFormatWatchMessage:
             progress_pixels=50,
             regress_pixels=3,
         )
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "50.6%" in result
         assert "1,234" in result
@@ -103,7 +101,6 @@ class TestFormatWatchMessage:
             num_target=2500,
             completion_percent=100.0,
         )
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "Complete" in result
         assert "2,500" in result
@@ -121,7 +118,6 @@ class TestFormatWatchMessage:
             num_target=1000,
             completion_percent=0.0,
         )
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "Not started" in result
         assert "1,000" in result
@@ -140,7 +136,6 @@ class TestFormatWatchMessage:
             num_target=1000,
             completion_percent=50.0,
         )
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "10.5 px/hr" in result
         assert "ETA:" in result
@@ -159,7 +154,6 @@ class TestFormatWatchMessage:
             num_target=1000,
             completion_percent=50.0,
         )
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "-2.0 px/hr" in result
         assert "ETA:" not in result
@@ -179,7 +173,6 @@ class TestFormatWatchMessage:
             num_target=1000,
             completion_percent=70.0,
         )
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "Best: 75.0%" in result
 
@@ -198,7 +191,6 @@ class TestFormatWatchMessage:
             num_target=1000,
             completion_percent=50.0,
         )
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "Worst grief: 42 px" in result
 
@@ -228,7 +220,6 @@ class TestFormatWatchMessage:
             progress_pixels=100,
             regress_pixels=0,
         )
-        await info.fetch_related_owner()
         result = await format_watch_message(info)
         assert "Last 24h: +130 / -5" in result
 
@@ -367,7 +358,7 @@ class TestFormatGriefMessage:
     async def test_with_discord_id(self):
         person = await Person.create(name="Victim", discord_id=12345)
         info = await ProjectInfo.from_rect(RECT, person.id, "my art")
-        await info.fetch_related_owner()
+        info.owner = person
         painters = (Painter(user_id=99, user_name="Griefer", alliance_name="Bad", discord_id="", discord_name=""),)
         proj = _grief_project(info, GriefReport(regress_count=150, painters=painters))
         result = format_grief_message(proj)
@@ -381,7 +372,7 @@ class TestFormatGriefMessage:
     async def test_without_discord_id(self):
         person = await Person.create(name="NoDC")
         info = await ProjectInfo.from_rect(RECT, person.id, "project")
-        await info.fetch_related_owner()
+        info.owner = person
         painters = (Painter(user_id=1, user_name="X", alliance_name="", discord_id="", discord_name=""),)
         proj = _grief_project(info, GriefReport(regress_count=200, painters=painters))
         result = format_grief_message(proj)
@@ -391,7 +382,7 @@ class TestFormatGriefMessage:
     async def test_multiple_painters(self):
         person = await Person.create(name="V", discord_id=55555)
         info = await ProjectInfo.from_rect(RECT, person.id, "art")
-        await info.fetch_related_owner()
+        info.owner = person
         painters = (
             Painter(user_id=1, user_name="Alice", alliance_name="A", discord_id="", discord_name=""),
             Painter(user_id=2, user_name="Bob", alliance_name="B", discord_id="", discord_name=""),
@@ -412,12 +403,11 @@ class TestGetWatchImagePaths:
         person = await Person.create(name="Creator", discord_id=80001)
         info = ProjectInfo(owner_id=person.id, name="wip", state=ProjectState.CREATING, width=50, height=50)
         await info.save_as_new()
-        await info.fetch_related_owner()
+        info.owner = person
         assert get_watch_image_paths(info) == {}
 
     async def test_returns_existing_paths(self, setup_config):
         person, info = await _person_and_project()
-        await info.fetch_related_owner()
         from pixel_hawk.models.config import get_config
 
         config = get_config()
@@ -439,7 +429,6 @@ class TestGetWatchImagePaths:
 
     async def test_only_goal_when_no_snapshot(self, setup_config):
         person, info = await _person_and_project()
-        await info.fetch_related_owner()
         from pixel_hawk.models.config import get_config
 
         config = get_config()
@@ -453,6 +442,5 @@ class TestGetWatchImagePaths:
 
     async def test_empty_when_no_files(self, setup_config):
         person, info = await _person_and_project()
-        await info.fetch_related_owner()
         paths = get_watch_image_paths(info)
         assert paths == {}
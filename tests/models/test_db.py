@@ -1,5 +1,7 @@
 """Tests for database initialization and query helpers."""
 
+import asyncio
+
 import aiosqlite
 import pytest
 
@@ -26,6 +28,16 @@ async def test_schema_creates_tables():
     assert "watch_message" in tables
 
 
+async def test_history_lookup_uses_project_index():
+    """Per-project history queries are served by the (project_id, timestamp) index, not a table scan."""
+    plan = await db.fetch_all(
+        "EXPLAIN QUERY PLAN SELECT * FROM history_change WHERE project_id = ? ORDER BY timestamp DESC", (1,)
+    )
+    details = " ".join(r["detail"] for r in plan)
+    assert "idx_history_change_project_timestamp" in details
+    assert "TEMP B-TREE" not in details
+
+
 async def test_foreign_keys_enabled():
     """PRAGMA foreign_keys is ON."""
     val = await db.fetch_val("PRAGMA foreign_keys")
@@ -198,6 +210,46 @@ async def test_transaction_nested_is_noop():
     assert count == 0
 
 
+async def test_transaction_keeps_other_tasks_writes_out():
+    """A write from another task waits for the transaction and survives its rollback."""
+
+    class Boom(Exception):
+        pass
+
+    async def write_elsewhere():
+        await db.execute("INSERT INTO person (name) VALUES (?)", ("elsewhere",))
+
+    with pytest.raises(Boom):
+        async with db.transaction():
+            await db.execute("INSERT INTO person (name) VALUES (?)", ("inside",))
+            other = asyncio.create_task(write_elsewhere())
+            await asyncio.sleep(0.01)
+            assert not other.done()  # blocked on the open transaction
+            raise Boom()
+    await other
+    assert await db.fetch_int("SELECT COUNT(*) FROM person WHERE name = ?", ("inside",)) == 0
+    assert await db.fetch_int("SELECT COUNT(*) FROM person WHERE name = ?", ("elsewhere",)) == 1
+
+
+async def test_transaction_in_another_task_waits():
+    """transaction() in a second task is not mistaken for a nested one; it runs after the first."""
+    order: list[str] = []
+
+    async def second():
+        async with db.transaction():
+            order.append("second")
+            await db.execute("INSERT INTO person (name) VALUES (?)", ("second",))
+
+    async with db.transaction():
+        other = asyncio.create_task(second())
+        await asyncio.sleep(0.01)
+        order.append("first")
+        await db.execute("INSERT INTO person (name) VALUES (?)", ("first",))
+    await other
+    assert order == ["first", "second"]
+    assert await db.fetch_int("SELECT COUNT(*) FROM person WHERE name IN (?, ?)", ("first", "second")) == 2
+
+
 # --- Migration bootstrap ---
 
 
@@ -1,9 +1,24 @@
 import io
+import os
 
 import pytest
 
+from pixel_hawk.models import palette
 from pixel_hawk.models.palette import PALETTE
 
+# A known palette color (first entry of the internal sorted index), as an (r, g, b) tuple
+_RGB0 = ((PALETTE._idx[0] >> 16) & 0xFF, (PALETTE._idx[0] >> 8) & 0xFF, PALETTE._idx[0] & 0xFF)
+
+
+@pytest.fixture(scope="module")
+def tiny_rgba_png():
+    """PNG bytes of a 1x1 RGBA image holding a valid palette color, encoded once per module."""
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGBA", (1, 1), (*_RGB0, 255)).save(buf, format="PNG")
+    return buf.getvalue()
+
 
 def test_lookup_transparent():
     # alpha 0 should map to palette index 0
@@ -12,6 +27,17 @@ def test_lookup_transparent():
     assert report == {}
 
 
+def test_lookup_transparent_skips_search(monkeypatch):
+    # alpha 0 must short-circuit before the binary search, even for colors outside the palette
+    def no_search(*_):
+        raise AssertionError("bisect_left called for a transparent pixel")
+
+    monkeypatch.setattr(palette, "bisect_left", no_search)
+    report = {}
+    assert PALETTE.lookup(report, (250, 251, 252, 0)) == 0
+    assert report == {}
+
+
 def test_lookup_unknown_color_tracked():
     # use an unlikely RGB value that's not in palette
     report = {}
@@ -26,16 +52,19 @@ def test_new_creates_paletted_image():
     assert im.mode == "P"
     # transparency should be set to palette index 0
     assert im.info.get("transparency") == 0
+    assert set(im.get_flattened_data()) == {0}
+
+
+def test_new_fills_with_palette_index():
+    im = PALETTE.new((3, 2), 5)
+    assert bytes(im.get_flattened_data()) == bytes([5]) * 6
+    assert im.getpalette() == PALETTE.new((1, 1)).getpalette()
 
 
 def test_ensure_converts_rgba_and_lookup_valid_color():
     from PIL import Image
 
-    # pick a known palette color from internal index list
-    rgb_int = PALETTE._idx[0]
-    r = (rgb_int >> 16) & 0xFF
-    g = (rgb_int >> 8) & 0xFF
-    b = rgb_int & 0xFF
+    r, g, b = _RGB0
 
     # create an RGBA image with that color and ensure conversion
     im = Image.new("RGBA", (2, 2), (r, g, b, 255))
@@ -52,9 +81,13 @@ def test_open_file_with_existing_paletted_file(tmp_path):
     im = PALETTE.new((2, 2))
     im.putdata([0, 1, 2, 3])
     im.save(path)
+    im.close()
+    os.utime(path, (0, 0))
 
-    opened = PALETTE.open_file(path)
-    assert opened.mode == "P"
+    with PALETTE.open_file(path) as opened:
+        assert opened.mode == "P"
+    # already in the right palette: must not be re-encoded and overwritten
+    assert path.stat().st_mtime == 0
 
 
 def test_ensure_rgba_conversion_for_rgb_image():
@@ -97,15 +130,9 @@ async def test_aopen_file(tmp_path):
     assert getattr(image, "fp", None) is None
 
 
-async def test_aopen_file_converts_non_paletted(tmp_path):
-    from PIL import Image
-
-    # pick a known palette color
-    rgb_int = PALETTE._idx[0]
-    r, g, b = (rgb_int >> 16) & 0xFF, (rgb_int >> 8) & 0xFF, rgb_int & 0xFF
-
+async def test_aopen_file_converts_non_paletted(tmp_path, tiny_rgba_png):
     path = tmp_path / "rgba.png"
-    Image.new("RGBA", (1, 1), (r, g, b, 255)).save(path)
+    path.write_bytes(tiny_rgba_png)
 
     async with PALETTE.aopen_file(path) as image:
         assert image.mode == "P"
@@ -125,16 +152,8 @@ async def test_aopen_bytes():
     assert getattr(image, "fp", None) is None
 
 
-async def test_aopen_bytes_converts_non_paletted():
-    from PIL import Image
-
-    rgb_int = PALETTE._idx[0]
-    r, g, b = (rgb_int >> 16) & 0xFF, (rgb_int >> 8) & 0xFF, rgb_int & 0xFF
-
-    buf = io.BytesIO()
-    Image.new("RGBA", (1, 1), (r, g, b, 255)).save(buf, format="PNG")
-
-    async with PALETTE.aopen_bytes(buf.getvalue()) as image:
+async def test_aopen_bytes_converts_non_paletted(tiny_rgba_png):
+    async with PALETTE.aopen_bytes(tiny_rgba_png) as image:
         assert image.mode == "P"
 
 
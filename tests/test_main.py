@@ -1,20 +1,12 @@
 import asyncio
 from unittest.mock import AsyncMock
 
-import pytest
-
 from pixel_hawk import main as main_mod
 from pixel_hawk.models.geometry import Point, Rectangle, Size
 from pixel_hawk.models.person import Person
 from pixel_hawk.models.project import ProjectInfo
 
 
-@pytest.fixture
-async def test_person():
-    """Create a test person for use in tests."""
-    return await Person.create(name="TestPerson")
-
-
 # Database-first loading tests
 
 
@@ -1,11 +1,22 @@
 """Tests for multi-user functionality and project state management."""
 
+import sqlite3
+
 import pytest
 
+from pixel_hawk.models import db
 from pixel_hawk.models.person import Person
 from pixel_hawk.models.project import DiffStatus, HistoryChange, ProjectInfo, ProjectState
 from pixel_hawk.models.geometry import Point, Rectangle, Size
 
+# Shared immutable rectangles
+_RECT_100 = Rectangle.from_point_size(Point(0, 0), Size(100, 100))
+_RECT_100_C = Rectangle.from_point_size(Point(1000, 0), Size(100, 100))
+# One full tile each: tiles (0,0), (1,0), (2,0), (3,0)
+_RECT_1K_0, _RECT_1K_1, _RECT_1K_2, _RECT_1K_3 = (
+    Rectangle.from_point_size(Point(1000 * tx, 0), Size(1000, 1000)) for tx in range(4)
+)
+
 
 @pytest.fixture
 async def person1():
@@ -24,11 +35,9 @@ async def person2():
 
 async def test_same_name_different_owners(person1, person2):
     """Test that different owners can have projects with the same name."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(100, 100))
-
     # Both persons create projects with same name
-    info1 = await ProjectInfo.from_rect(rect, person1.id, "my_project")
-    info2 = await ProjectInfo.from_rect(rect, person2.id, "my_project")
+    info1 = await ProjectInfo.from_rect(_RECT_100, person1.id, "my_project")
+    info2 = await ProjectInfo.from_rect(_RECT_100, person2.id, "my_project")
 
     # Fetch owner relationships
     await info1.fetch_related_owner()
@@ -44,33 +53,27 @@ async def test_same_name_different_owners(person1, person2):
 
 async def test_same_owner_duplicate_name_fails(person1):
     """Test that unique constraint prevents duplicate names per owner."""
-    rect1 = Rectangle.from_point_size(Point(0, 0), Size(100, 100))
-    rect2 = Rectangle.from_point_size(Point(1000, 1000), Size(100, 100))
-
     # Create first project
-    await ProjectInfo.from_rect(rect1, person1.id, "duplicate_name")
+    info = await ProjectInfo.from_rect(_RECT_100, person1.id, "duplicate_name")
+
+    # Same name and owner under a different ID is rejected by UNIQUE(owner_id, name)
+    with pytest.raises(sqlite3.IntegrityError, match="project.owner_id, project.name"):
+        await db.execute(
+            "INSERT INTO project (id, owner_id, name) VALUES (?, ?, ?)", (info.id + 1, person1.id, "duplicate_name")
+        )
 
-    # Try to create second project with same name and owner
-    try:
-        await ProjectInfo.from_rect(rect2, person1.id, "duplicate_name")
-        # If we got here, the unique constraint didn't work
-        assert False, "Expected unique constraint violation"
-    except Exception as e:
-        # Expected - unique constraint should prevent this
-        assert "unique" in str(e).lower() or "constraint" in str(e).lower()
+    assert len(await ProjectInfo.filter_by_owner(person1.id)) == 1
 
 
 async def test_owner_isolation_in_lookups(person1, person2):
     """Test that lookups correctly filter by owner_id."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(100, 100))
-
     # Both owners create projects with same name
-    info1 = await ProjectInfo.from_rect(rect, person1.id, "shared_name")
-    info2 = await ProjectInfo.from_rect(rect, person2.id, "shared_name")
+    info1 = await ProjectInfo.from_rect(_RECT_100, person1.id, "shared_name")
+    info2 = await ProjectInfo.from_rect(_RECT_100, person2.id, "shared_name")
 
     # get_or_create should return correct project for each owner
-    lookup1 = await ProjectInfo.get_or_create_from_rect(rect, person1.id, "shared_name")
-    lookup2 = await ProjectInfo.get_or_create_from_rect(rect, person2.id, "shared_name")
+    lookup1 = await ProjectInfo.get_or_create_from_rect(_RECT_100, person1.id, "shared_name")
+    lookup2 = await ProjectInfo.get_or_create_from_rect(_RECT_100, person2.id, "shared_name")
 
     # Fetch owner relationships
     await lookup1.fetch_related_owner()
@@ -84,11 +87,9 @@ async def test_owner_isolation_in_lookups(person1, person2):
 
 async def test_history_change_fk_with_multiuser(person1, person2):
     """Test that HistoryChange FK works correctly with integer ProjectInfo IDs."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(100, 100))
-
     # Create projects for both owners
-    info1 = await ProjectInfo.from_rect(rect, person1.id, "project1")
-    info2 = await ProjectInfo.from_rect(rect, person2.id, "project2")
+    info1 = await ProjectInfo.from_rect(_RECT_100, person1.id, "project1")
+    info2 = await ProjectInfo.from_rect(_RECT_100, person2.id, "project2")
 
     # Create history changes for both projects
     change1 = await HistoryChange.create(
@@ -124,11 +125,8 @@ async def test_history_change_fk_with_multiuser(person1, person2):
 async def test_watched_tiles_tracking(person1):
     """Test end-to-end tile counting across multiple projects."""
     # Create two non-overlapping projects
-    rect1 = Rectangle.from_point_size(Point(0, 0), Size(1000, 1000))
-    rect2 = Rectangle.from_point_size(Point(1000, 0), Size(1000, 1000))
-
-    await ProjectInfo.from_rect(rect1, person1.id, "project1")
-    await ProjectInfo.from_rect(rect2, person1.id, "project2")
+    await ProjectInfo.from_rect(_RECT_1K_0, person1.id, "project1")
+    await ProjectInfo.from_rect(_RECT_1K_1, person1.id, "project2")
 
     # Update watched tiles count
     await person1.update_totals()
@@ -144,34 +142,27 @@ async def test_watched_tiles_tracking(person1):
 async def test_watched_tiles_overlapping_counted_once(person1):
     """Test that overlapping tiles are counted only once."""
     # Create two overlapping projects
-    rect1 = Rectangle.from_point_size(Point(0, 0), Size(1000, 1000))
     rect2 = Rectangle.from_point_size(Point(500, 500), Size(1000, 1000))
 
-    await ProjectInfo.from_rect(rect1, person1.id, "project1")
+    await ProjectInfo.from_rect(_RECT_1K_0, person1.id, "project1")
     await ProjectInfo.from_rect(rect2, person1.id, "project2")
 
-    # Update watched tiles count
+    # Update watched tiles count (update_totals sets the counters in place)
     await person1.update_totals()
 
-    # Reload from DB
-    person = await Person.get_by_id(person1.id)
-
     # Overlapping tiles should be counted only once
-    assert person.watched_tiles_count > 0
-    # rect1 covers tile (0,0); rect2 spans (500,500)-(1500,1500) covering 4 tiles
+    assert person1.watched_tiles_count > 0
+    # _RECT_1K_0 covers tile (0,0); rect2 spans (500,500)-(1500,1500) covering 4 tiles
     # Union = 4 unique tiles, with tile (0,0) shared (deduplicated)
-    assert person.watched_tiles_count == 4
-    assert person.active_projects_count == 2
+    assert person1.watched_tiles_count == 4
+    assert person1.active_projects_count == 2
 
 
 async def test_state_affects_tile_count(person1):
     """Test that changing state to passive/inactive updates tile count."""
     # Create two projects
-    rect1 = Rectangle.from_point_size(Point(0, 0), Size(1000, 1000))
-    rect2 = Rectangle.from_point_size(Point(1000, 0), Size(1000, 1000))
-
-    info1 = await ProjectInfo.from_rect(rect1, person1.id, "project1", ProjectState.ACTIVE)
-    info2 = await ProjectInfo.from_rect(rect2, person1.id, "project2", ProjectState.ACTIVE)
+    info1 = await ProjectInfo.from_rect(_RECT_1K_0, person1.id, "project1", ProjectState.ACTIVE)
+    info2 = await ProjectInfo.from_rect(_RECT_1K_1, person1.id, "project2", ProjectState.ACTIVE)
 
     # Update tile count (both active)
     await person1.update_totals()
@@ -190,8 +181,9 @@ async def test_state_affects_tile_count(person1):
     # Change both to inactive
     info1.state = ProjectState.INACTIVE
     info2.state = ProjectState.INACTIVE
-    await info1.save()
-    await info2.save()
+    async with db.transaction():  # one commit for both UPDATEs
+        await info1.save()
+        await info2.save()
 
     # Update tile count (none counted)
     await person1.update_totals()
@@ -201,13 +193,9 @@ async def test_state_affects_tile_count(person1):
 async def test_only_active_projects_in_update_totals(person1):
     """Test that update_totals only includes active projects."""
     # Create projects in different states
-    rect1 = Rectangle.from_point_size(Point(0, 0), Size(1000, 1000))
-    rect2 = Rectangle.from_point_size(Point(1000, 0), Size(1000, 1000))
-    rect3 = Rectangle.from_point_size(Point(2000, 0), Size(1000, 1000))
-
-    await ProjectInfo.from_rect(rect1, person1.id, "active", ProjectState.ACTIVE)
-    await ProjectInfo.from_rect(rect2, person1.id, "passive", ProjectState.PASSIVE)
-    await ProjectInfo.from_rect(rect3, person1.id, "inactive", ProjectState.INACTIVE)
+    await ProjectInfo.from_rect(_RECT_1K_0, person1.id, "active", ProjectState.ACTIVE)
+    await ProjectInfo.from_rect(_RECT_1K_1, person1.id, "passive", ProjectState.PASSIVE)
+    await ProjectInfo.from_rect(_RECT_1K_2, person1.id, "inactive", ProjectState.INACTIVE)
 
     # Update totals
     await person1.update_totals()
@@ -222,23 +210,19 @@ async def test_only_active_projects_in_update_totals(person1):
 
 async def test_projectinfo_state_default(person1):
     """Test that ProjectInfo state defaults to ACTIVE."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(100, 100))
-    info = await ProjectInfo.from_rect(rect, person1.id, "test")
+    info = await ProjectInfo.from_rect(_RECT_100, person1.id, "test")
 
     assert info.state == ProjectState.ACTIVE
 
 
 async def test_projectinfo_state_can_be_set(person1):
     """Test that ProjectInfo state can be set to different values."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(100, 100))
-
     # Create with passive state
-    info_passive = await ProjectInfo.from_rect(rect, person1.id, "passive", ProjectState.PASSIVE)
+    info_passive = await ProjectInfo.from_rect(_RECT_100, person1.id, "passive", ProjectState.PASSIVE)
     assert info_passive.state == ProjectState.PASSIVE
 
     # Create with inactive state
-    rect2 = Rectangle.from_point_size(Point(1000, 0), Size(100, 100))
-    info_inactive = await ProjectInfo.from_rect(rect2, person1.id, "inactive", ProjectState.INACTIVE)
+    info_inactive = await ProjectInfo.from_rect(_RECT_100_C, person1.id, "inactive", ProjectState.INACTIVE)
     assert info_inactive.state == ProjectState.INACTIVE
 
 
@@ -256,24 +240,17 @@ async def test_projectinfo_filename_property(person1):
 async def test_multiple_owners_different_tiles(person1, person2):
     """Test that different owners can watch different sets of tiles."""
     # Person 1 watches tiles 0,0 and 1,0
-    rect1a = Rectangle.from_point_size(Point(0, 0), Size(1000, 1000))
-    rect1b = Rectangle.from_point_size(Point(1000, 0), Size(1000, 1000))
-    await ProjectInfo.from_rect(rect1a, person1.id, "project1a")
-    await ProjectInfo.from_rect(rect1b, person1.id, "project1b")
+    await ProjectInfo.from_rect(_RECT_1K_0, person1.id, "project1a")
+    await ProjectInfo.from_rect(_RECT_1K_1, person1.id, "project1b")
 
     # Person 2 watches tiles 2,0 and 3,0
-    rect2a = Rectangle.from_point_size(Point(2000, 0), Size(1000, 1000))
-    rect2b = Rectangle.from_point_size(Point(3000, 0), Size(1000, 1000))
-    await ProjectInfo.from_rect(rect2a, person2.id, "project2a")
-    await ProjectInfo.from_rect(rect2b, person2.id, "project2b")
+    await ProjectInfo.from_rect(_RECT_1K_2, person2.id, "project2a")
+    await ProjectInfo.from_rect(_RECT_1K_3, person2.id, "project2b")
 
     # Update tile counts
     await person1.update_totals()
     await person2.update_totals()
 
     # Each person should watch 2 tiles
-    person1_reloaded = await Person.get_by_id(person1.id)
-    person2_reloaded = await Person.get_by_id(person2.id)
-
-    assert person1_reloaded.watched_tiles_count == 2
-    assert person2_reloaded.watched_tiles_count == 2
+    assert person1.watched_tiles_count == 2
+    assert person2.watched_tiles_count == 2
@@ -17,7 +17,7 @@ from pixel_hawk.models.palette import PALETTE
 
 def _paletted_png_bytes(size=(1, 1), data=(0,)):
     im = PALETTE.new(size)
-    im.putdata(list(data))
+    im.frombytes(bytes(data))
     buf = io.BytesIO()
     im.save(buf, format="PNG")
     return buf.getvalue()
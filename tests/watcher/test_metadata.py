@@ -7,16 +7,9 @@ import pytest
 
 from pixel_hawk.watcher import metadata
 from pixel_hawk.models.geometry import Point, Rectangle, Size
-from pixel_hawk.models.person import Person
 from pixel_hawk.models.project import HistoryChange, ProjectInfo
 
 
-@pytest.fixture
-async def test_person():
-    """Create a test person for use in tests."""
-    return await Person.create(name="TestPerson")
-
-
 async def test_project_info_default_initialization(test_person):
     """Test ProjectInfo can be created with defaults via DB."""
     info = ProjectInfo(owner_id=test_person.id, owner=test_person, name="test")
@@ -248,6 +241,31 @@ async def test_compare_snapshots_skips_transparent():
     assert regress == 0
 
 
+async def test_compare_snapshots_uses_common_prefix():
+    """Test that buffers of different lengths are compared over their shared prefix only."""
+    target = bytes([1, 2, 3, 4])
+    prev = bytes([1, 0, 3])  # shorter snapshot, e.g. from before the target was resized
+    current = bytes([0, 2, 3, 0, 9])
+
+    assert metadata.compare_snapshots(current, prev, target) == (1, 1)
+    assert metadata.find_regressed_indices(current, prev, target) == [0]
+
+
+@pytest.mark.parametrize("prev", [bytes([1, 0, 3, 0]), bytes([1, 0, 3])], ids=["full", "short"])
+async def test_process_diff_counts_match_compare_snapshots(test_person, prev):
+    """Test process_diff reports the same progress/regress as compare_snapshots, whatever the snapshot length."""
+    info = ProjectInfo(owner_id=test_person.id, owner=test_person, name="diff_counts")
+    await info.save_as_new()
+    target = bytes([1, 2, 3, 4])
+    current = bytes([0, 2, 3, 0])
+
+    change = metadata.process_diff(info, current, target, prev)
+
+    assert (change.progress_pixels, change.regress_pixels) == metadata.compare_snapshots(current, prev, target)
+    assert (change.progress_pixels, change.regress_pixels) == (1, 1)
+    assert change.num_remaining == 2
+
+
 async def test_update_completion_new_record(test_person):
     """Test updating max completion when improved."""
     info = ProjectInfo(owner_id=test_person.id, owner=test_person, name="comp_new")
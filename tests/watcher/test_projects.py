@@ -1,5 +1,7 @@
+import asyncio
+import functools
 import io
-
+import os
 
 import pytest
 from PIL import Image
@@ -7,26 +9,49 @@ from PIL import Image
 from pixel_hawk.watcher import projects
 from pixel_hawk.models.config import get_config
 from pixel_hawk.models.geometry import Point, Rectangle, Size
-from pixel_hawk.models.person import Person
-from pixel_hawk.models.project import HistoryChange, ProjectInfo
-from pixel_hawk.models.palette import PALETTE, AsyncImage
-
+from pixel_hawk.models.project import DiffStatus, HistoryChange, ProjectInfo
+from pixel_hawk.models.palette import PALETTE
 
-@pytest.fixture
-async def test_person():
-    """Create a test person for use in tests."""
-    return await Person.create(name="TestPerson")
+# Shared immutable rectangles anchored at the origin
+_RECT_2 = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
+_RECT_4 = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
+_RECT_10 = Rectangle.from_point_size(Point(0, 0), Size(10, 10))
+_RECT_1K = Rectangle.from_point_size(Point(0, 0), Size(1000, 1000))
+_RECT_2K_1K = Rectangle.from_point_size(Point(0, 0), Size(2000, 1000))
 
 
 def _paletted_image(size=(4, 4), value=1):
-    """Helper to create a paletted image for testing."""
-    im = PALETTE.new(size)
-    im.putdata([value] * (size[0] * size[1]))
-    return im
+    """Helper to create a paletted image for testing. Each call returns a fresh image."""
+    return PALETTE.new(size, value)
+
+
+@functools.lru_cache(maxsize=16)
+def _paletted_png_bytes(size=(1, 1), value=0):
+    """PNG encoding of a uniform paletted image, encoded once per (size, value).
+
+    Stored without compression; tests only need a valid PNG, not a small one.
+    """
+    buf = io.BytesIO()
+    _paletted_image(size, value).save(buf, format="PNG", compress_level=0)
+    return buf.getvalue()
+
+
+def _fast_touch(path):
+    """Create an empty file without the utime() call that Path.touch() tries first."""
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+
+
+def _touch_tiles(tiles_dir, rect):
+    """Create an empty cache file for every tile the rectangle covers."""
+    base = os.fspath(tiles_dir)
+    for tile in rect.tiles:
+        _fast_touch(f"{base}/tile-{tile}.png")
 
 
 class FakeAsyncImage:
-    """Mock AsyncImage for tests that need to patch aopen_file."""
+    """Mock AsyncImage for tests that need to patch aopen_file; yields the wrapped image."""
+
+    __slots__ = ("_image",)
 
     def __init__(self, image):
         self._image = image
@@ -41,21 +66,82 @@ class FakeAsyncImage:
         return self._image
 
 
-async def _make_project(rect, owner_id, *, name="test", touch=False):
+class FakeFlatImage:
+    """Stand-in for a paletted image backed by raw palette-index bytes.
+
+    Provides what run_diff touches (size, tobytes, save, close, context manager), so it can be
+    returned from stitch_tiles or wrapped in FakeAsyncImage as a target.
+    """
+
+    __slots__ = ("_data", "size")
+
+    def __init__(self, data, size=(1, 1)):
+        self._data = data
+        self.size = size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def tobytes(self):
+        return self._data
+
+    def save(self, path):
+        pass
+
+    def close(self):
+        pass
+
+
+def _flat_image(size, value):
+    """Uniform canvas over raw palette-index bytes, for diffs that never touch PIL."""
+    return FakeFlatImage(bytes([value]) * (size[0] * size[1]), size)
+
+
+def _patch_target(monkeypatch, image):
+    """Patch PALETTE.aopen_file to hand out one shared FakeAsyncImage for every open."""
+    fake = FakeAsyncImage(image)
+    monkeypatch.setattr(PALETTE, "aopen_file", lambda path: fake)
+
+
+def _stitch_sequence(results):
+    """Build a stitch_tiles replacement that returns the given canvases in order, one per run_diff."""
+    results = list(results)
+
+    async def fake_stitch(rect):
+        return results.pop(0)
+
+    return fake_stitch
+
+
+async def _make_project(rect, owner, *, name="test", touch=False):
     """Helper to create a Project with a DB-backed ProjectInfo.
 
-    Creates the project file at the canonical path. If touch=True, creates an empty file
-    instead of a valid paletted image.
+    The owner Person is attached directly rather than re-fetched, so this costs one DB round
+    trip. Creates the project file at the canonical path. If touch=True, writes a 1x1
+    transparent placeholder PNG instead of a full-size target image; tests using it patch
+    aopen_file.
     """
-    info = await ProjectInfo.get_or_create_from_rect(rect, owner_id, name)
-    await info.fetch_related_owner()
-    path = get_config().projects_dir / str(info.owner.id) / info.filename
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if touch:
-        path.touch()
-    else:
-        im = _paletted_image(rect.size, value=1)
-        im.save(path)
+    info = await ProjectInfo.get_or_create_from_rect(rect, owner.id, name)
+    info.owner = owner
+    path = get_config().projects_dir / str(owner.id) / info.filename
+    path.write_bytes(_paletted_png_bytes((1, 1), 0) if touch else _paletted_png_bytes(tuple(rect.size), 1))
+    return projects.Project(info)
+
+
+def _make_project_nodb(rect, owner, *, name="test"):
+    """Helper to create a Project around a detached ProjectInfo that is never saved.
+
+    For tests that never read the project file or persist the row, so the file is created
+    empty and never PNG-encoded. run_diff needs a saved row because HistoryChange references it,
+    so those tests use _make_project instead.
+    """
+    info = ProjectInfo(
+        owner_id=owner.id, owner=owner, name=name, x=rect.point.x, y=rect.point.y, width=rect.size.w, height=rect.size.h
+    )
+    _fast_touch(get_config().projects_dir / str(owner.id) / info.filename)
     return projects.Project(info)
 
 
@@ -64,9 +150,7 @@ async def _make_project(rect, owner_id, *, name="test", touch=False):
 
 async def test_from_info_valid_project(tmp_path, setup_config, test_person, monkeypatch):
     """Test Project.from_info successfully loads a valid project."""
-    # Create project directory for test person
     person_dir = setup_config.projects_dir / str(test_person.id)
-    person_dir.mkdir(parents=True, exist_ok=True)
 
     # Create a valid project file
     rect = Rectangle.from_point_size(Point(1000, 1000), Size(10, 10))
@@ -74,17 +158,14 @@ async def test_from_info_valid_project(tmp_path, setup_config, test_person, monk
 
     # Create the actual image file
     path = person_dir / info.filename
-    im = PALETTE.new((10, 10))
-    im.putdata([1] * 100)
-    im.save(path)
+    path.write_bytes(_paletted_png_bytes((10, 10), 1))
 
     async def noop_run_diff(self):
         pass
 
     monkeypatch.setattr(projects.Project, "run_diff", noop_run_diff)
 
-    # Fetch owner relationship before loading project
-    await info.fetch_related_owner()
+    info.owner = test_person
 
     # Load project from info
     proj = await projects.Project.from_info(info)
@@ -95,11 +176,10 @@ async def test_from_info_valid_project(tmp_path, setup_config, test_person, monk
 
 async def test_from_info_missing_file(tmp_path, setup_config, test_person):
     """Test Project.from_info returns None when file is missing."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(10, 10))
+    rect = _RECT_10
     info = await ProjectInfo.from_rect(rect, test_person.id, "missing_project")
 
-    # Fetch owner relationship
-    await info.fetch_related_owner()
+    info.owner = test_person
 
     # Don't create the file - it should be missing
     proj = await projects.Project.from_info(info)
@@ -108,15 +188,12 @@ async def test_from_info_missing_file(tmp_path, setup_config, test_person):
 
 async def test_from_info_invalid_palette(tmp_path, setup_config, test_person):
     """Test Project.from_info returns None when file has invalid palette."""
-    # Create project directory for test person
     person_dir = setup_config.projects_dir / str(test_person.id)
-    person_dir.mkdir(parents=True, exist_ok=True)
 
-    rect = Rectangle.from_point_size(Point(0, 0), Size(10, 10))
+    rect = _RECT_10
     info = await ProjectInfo.from_rect(rect, test_person.id, "invalid_palette")
 
-    # Fetch owner relationship
-    await info.fetch_related_owner()
+    info.owner = test_person
 
     # Create file with wrong colors
     path = person_dir / info.filename
@@ -143,116 +220,79 @@ async def test_projectinfo_filename_property(test_person):
 async def test_run_diff_branches(monkeypatch, test_person):
     """Test run_diff with various scenarios (no change, changes)."""
     rect = Rectangle.from_point_size(Point.from4(0, 0, 0, 0), Size(1, 1))
-    proj = await _make_project(rect, test_person.id, touch=True)
-
-    class CM:
-        def __init__(self, data):
-            self.data = data
-            self.size = (1, 1)
-
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            return False
-
-        def get_flattened_data(self):
-            return self.data
-
-        def save(self, path):
-            pass
-
-        def close(self):
-            pass
+    proj = await _make_project(rect, test_person, touch=True)
 
-    # Case 1: no change (current == target)
-    target = bytes([1, 2, 3])
-    monkeypatch.setattr(PALETTE, "aopen_file", lambda path: FakeAsyncImage(CM(target)))
+    # Case 1: no change (current == target); case 2: progress branch (different data)
+    targets = [FakeAsyncImage(FakeFlatImage(b"\x01\x02\x03")), FakeAsyncImage(FakeFlatImage(b"\x00\x01\x02"))]
+    monkeypatch.setattr(PALETTE, "aopen_file", lambda path: targets.pop(0))
+    monkeypatch.setattr(
+        projects, "stitch_tiles", _stitch_sequence([FakeFlatImage(b"\x01\x02\x03"), FakeFlatImage(b"\x02\x03\x04")])
+    )
 
-    async def fake_stitch(rect):
-        return CM(target)
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch)
     await proj.run_diff()
-
-    # Case 2: progress branch (different data)
-    monkeypatch.setattr(PALETTE, "aopen_file", lambda path: FakeAsyncImage(CM(bytes([0, 1, 2]))))
-
-    async def fake_stitch2(rect):
-        return CM(bytes([2, 3, 4]))
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch2)
     await proj.run_diff()
 
 
 async def test_run_diff_complete_and_remaining(monkeypatch, test_person):
     """Test run_diff complete and progress calculation paths."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
-    p = await _make_project(rect, test_person.id, touch=True)
-
-    target = _paletted_image((4, 4), value=1)
-
-    # Case: current equals target -> complete branch
-    monkeypatch.setattr(PALETTE, "aopen_file", lambda path: FakeAsyncImage(target))
-
-    async def fake_stitch_complete(rect):
-        return _paletted_image((4, 4), value=1)
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch_complete)
-    await p.run_diff()
-
-    # Case: current different -> remaining/progress calculation path
-    monkeypatch.setattr(PALETTE, "aopen_file", lambda path: FakeAsyncImage(target))
-
-    async def fake_stitch_partial(rect):
-        return _paletted_image((4, 4), value=0)
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch_partial)
-    await p.run_diff()
+    rect = _RECT_4
+    p = await _make_project(rect, test_person, touch=True)
+
+    _patch_target(monkeypatch, _paletted_image((4, 4), value=1))
+    # Real images, so the first check leaves a snapshot on disk for the second one to compare against
+    monkeypatch.setattr(
+        projects, "stitch_tiles", _stitch_sequence([_paletted_image((4, 4), value=1), _paletted_image((4, 4), value=0)])
+    )
+
+    # First current equals target -> complete branch
+    change = await p.run_diff()
+    assert change.status == DiffStatus.COMPLETE
+    assert change.num_remaining == 0
+    assert "Complete!" in p.info.last_log_message
+    assert (p.info.total_progress, p.info.total_regress) == (0, 0)
+
+    # Then every pixel is wiped -> remaining path, with the loss counted against the snapshot
+    change = await p.run_diff()
+    assert change.status == DiffStatus.IN_PROGRESS
+    assert change.num_remaining == 16
+    assert "16px remaining" in p.info.last_log_message
+    assert "[+0/-16]" in p.info.last_log_message
+    assert (p.info.total_progress, p.info.total_regress) == (0, 16)
 
 
 # Project.has_been_modified tests
 
 
-async def test_project_has_been_modified(test_person):
-    """Test Project.has_been_modified detects file changes."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
-    proj = await _make_project(rect, test_person.id)
-
-    assert not proj.has_been_modified()
-
-    real_mtime = round(proj.path.stat().st_mtime)
-    proj.mtime = real_mtime - 1
-
-    assert proj.has_been_modified()
+def _backdate_file(proj):
+    os.utime(proj.path, (proj.mtime - 2, proj.mtime - 2))
 
 
-async def test_project_has_been_modified_with_oserror(test_person):
-    """Test Project.has_been_modified handles OSError."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
-    proj = await _make_project(rect, test_person.id)
+@pytest.mark.parametrize(
+    "change, expected",
+    [
+        pytest.param(None, False, id="fresh"),
+        pytest.param(_backdate_file, True, id="modified"),
+        pytest.param(lambda proj: proj.path.unlink(), True, id="missing"),
+        pytest.param(lambda proj: setattr(proj, "mtime", 0), True, id="zero-mtime"),
+    ],
+)
+async def test_project_has_been_modified(test_person, change, expected):
+    """Test Project.has_been_modified against the file's real mtime, a missing file, and an unset mtime."""
+    proj = _make_project_nodb(_RECT_2, test_person)
+    if change:
+        change(proj)
 
-    proj.path.unlink()
-    assert proj.has_been_modified()
-
-
-async def test_project_has_been_modified_with_none_mtime(test_person):
-    """Test Project.has_been_modified when mtime is 0."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
-    proj = await _make_project(rect, test_person.id)
-    proj.mtime = 0
-
-    assert proj.has_been_modified()
+    assert proj.has_been_modified() is expected
 
 
 async def test_project_equality_and_hash(test_person):
     """Test Project __eq__ and __hash__ methods."""
-    rect1 = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
+    rect1 = _RECT_2
     rect2 = Rectangle.from_point_size(Point(2000, 0), Size(2, 2))
 
-    proj1 = await _make_project(rect1, test_person.id, name="a")
-    proj2 = await _make_project(rect1, test_person.id, name="a")
-    proj3 = await _make_project(rect2, test_person.id, name="b")
+    proj1 = _make_project_nodb(rect1, test_person, name="a")
+    proj2 = _make_project_nodb(rect1, test_person, name="a")
+    proj3 = _make_project_nodb(rect2, test_person, name="b")
 
     assert proj1 == proj2
     assert hash(proj1) == hash(proj2)
@@ -263,8 +303,8 @@ async def test_project_equality_and_hash(test_person):
 
 async def test_project_deletion(test_person):
     """Test Project deletion does not raise."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
-    proj = await _make_project(rect, test_person.id)
+    rect = _RECT_2
+    proj = _make_project_nodb(rect, test_person)
     del proj
 
 
@@ -273,8 +313,8 @@ async def test_project_deletion(test_person):
 
 async def test_project_info_save_and_load(test_person):
     """Test ProjectInfo persistence via DB."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
-    proj = await _make_project(rect, test_person.id)
+    rect = _RECT_2
+    proj = await _make_project(rect, test_person)
 
     proj.info.max_completion_pixels = 42
     proj.info.total_progress = 100
@@ -289,8 +329,8 @@ async def test_project_info_save_and_load(test_person):
 
 async def test_project_snapshot_save_and_load(test_person):
     """Test snapshot persistence."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
-    proj = await _make_project(rect, test_person.id)
+    rect = _RECT_4
+    proj = _make_project_nodb(rect, test_person)
 
     snapshot = _paletted_image((4, 4), value=2)
     await proj.save_snapshot(snapshot)
@@ -299,267 +339,87 @@ async def test_project_snapshot_save_and_load(test_person):
 
     async with proj.load_snapshot_if_exists() as loaded:
         assert loaded is not None
-        data = loaded.get_flattened_data()
-        assert all(v == 2 for v in data)
+        assert loaded.tobytes() == bytes([2]) * 16
 
 
 async def test_project_snapshot_load_nonexistent(test_person):
     """Test loading snapshot when it doesn't exist."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
-    proj = await _make_project(rect, test_person.id)
+    rect = _RECT_2
+    proj = _make_project_nodb(rect, test_person)
 
     async with proj.load_snapshot_if_exists() as snapshot:
         assert snapshot is None
 
 
-async def test_run_diff_with_info_tracking(monkeypatch, test_person):
-    """Test that run_diff updates info correctly."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
-    proj = await _make_project(rect, test_person.id, touch=True)
-
-    target = _paletted_image((4, 4), value=0)
-    target.putpixel((0, 0), 1)
-    target.putpixel((1, 1), 2)
-    target.putpixel((2, 2), 3)
-
-    current = _paletted_image((4, 4), value=0)
-    current.putpixel((0, 0), 1)
-
-    monkeypatch.setattr(PALETTE, "aopen_file", lambda path_arg: FakeAsyncImage(target))
-
-    async def fake_stitch(rect_arg):
-        return current
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch)
-
-    await proj.run_diff()
-
-    assert proj.info.last_check > 0
-    assert proj.info.max_completion_pixels > 0
-    assert proj.info.max_completion_percent > 0
-    assert proj.snapshot_path.exists()
-
-
-async def test_run_diff_creates_history_change(monkeypatch, test_person):
-    """Test that run_diff creates a HistoryChange record when progress is detected."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
-    proj = await _make_project(rect, test_person.id, touch=True)
-
-    target = _paletted_image((4, 4), value=0)
-    target.putpixel((0, 0), 1)
-    target.putpixel((1, 1), 2)
-
-    # First run: partial match, establishes snapshot (no progress yet since no prev)
-    current1 = _paletted_image((4, 4), value=0)
-    current1.putpixel((0, 0), 1)
-
-    original_open_file = PALETTE.open_file
-
-    def aopen_file_mock(path_arg):
-        if ".snapshot." in str(path_arg):
-            return AsyncImage(original_open_file, path_arg)
-        return FakeAsyncImage(target)
-
-    monkeypatch.setattr(PALETTE, "aopen_file", aopen_file_mock)
-
-    stitch_results = iter([current1])
-
-    async def fake_stitch(rect_arg):
-        return next(stitch_results)
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch)
-
-    await proj.run_diff()
-
-    # Second run: progress detected (pixel (1,1) now matches target)
-    current2 = _paletted_image((4, 4), value=0)
-    current2.putpixel((0, 0), 1)
-    current2.putpixel((1, 1), 2)
-
-    stitch_results = iter([current2])
-    await proj.run_diff()
-
-    # Should have created a HistoryChange record (progress detected)
-    changes = await HistoryChange.filter_by_project(proj.info.id)
-    assert len(changes) >= 1
-    assert changes[0].num_target > 0
-
+def _canvas(pixels):
+    """4x4 transparent canvas with the given {(x, y): palette index} pixels set."""
+    buf = bytearray(16)
+    for (x, y), value in pixels.items():
+        buf[y * 4 + x] = value
+    im = PALETTE.new((4, 4))
+    im.frombytes(bytes(buf))
+    return im
 
-async def test_run_diff_skips_history_change_without_progress_or_regress(monkeypatch, test_person):
-    """Test that HistoryChange is NOT saved when there are no progress or regress pixels."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
-    proj = await _make_project(rect, test_person.id, touch=True)
 
-    # Target has some non-transparent pixels; current partially matches (in-progress)
-    target = _paletted_image((4, 4), value=0)
-    target.putpixel((0, 0), 1)
-    target.putpixel((1, 1), 2)
+@pytest.fixture
+async def diff_project(monkeypatch, test_person):
+    """4x4 project whose target has two opaque pixels, (0,0)=1 and (1,1)=2."""
+    proj = await _make_project(_RECT_4, test_person, touch=True)
+    _patch_target(monkeypatch, _canvas({(0, 0): 1, (1, 1): 2}))
+    return proj
 
-    current = _paletted_image((4, 4), value=0)
-    current.putpixel((0, 0), 1)  # one pixel correct
 
-    original_open_file = PALETTE.open_file
+async def test_run_diff_with_info_tracking(monkeypatch, diff_project):
+    """Test that run_diff updates info correctly."""
+    monkeypatch.setattr(projects, "stitch_tiles", _stitch_sequence([_canvas({(0, 0): 1})]))
 
-    def aopen_file_mock(path_arg):
-        if ".snapshot." in str(path_arg):
-            return AsyncImage(original_open_file, path_arg)
-        return FakeAsyncImage(target)
+    await diff_project.run_diff()
 
-    monkeypatch.setattr(PALETTE, "aopen_file", aopen_file_mock)
+    assert diff_project.info.last_check > 0
+    assert diff_project.info.max_completion_pixels > 0
+    assert diff_project.info.max_completion_percent > 0
+    assert diff_project.snapshot_path.exists()
 
-    async def fake_stitch(rect_arg):
-        return current
 
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch)
+@pytest.mark.parametrize(
+    "second, progress, regress",
+    [
+        pytest.param({(0, 0): 1}, 0, 0, id="unchanged"),
+        pytest.param({(0, 0): 1, (1, 1): 2}, 1, 0, id="progress"),
+        pytest.param({(0, 0): 7}, 0, 1, id="regress"),
+    ],
+)
+async def test_run_diff_history_between_checks(monkeypatch, diff_project, second, progress, regress):
+    """The first check only establishes a snapshot; the second saves a HistoryChange iff pixels moved."""
+    proj = diff_project
+    monkeypatch.setattr(projects, "stitch_tiles", _stitch_sequence([_canvas({(0, 0): 1}), _canvas(second)]))
 
     # First diff: no previous snapshot, so progress=0, regress=0 → no HistoryChange saved
     await proj.run_diff()
-    changes = await HistoryChange.filter_by_project(proj.info.id)
-    assert len(changes) == 0
+    assert await HistoryChange.count_by_project(proj.info.id) == 0
 
-    # Second diff: snapshot matches current exactly (no change) → still no HistoryChange
-    await proj.run_diff()
-    changes = await HistoryChange.filter_by_project(proj.info.id)
-    assert len(changes) == 0
-
-
-async def test_run_diff_saves_history_change_with_progress(monkeypatch, test_person):
-    """Test that HistoryChange IS saved when there are progress pixels."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
-    proj = await _make_project(rect, test_person.id, touch=True)
-
-    target = _paletted_image((4, 4), value=0)
-    target.putpixel((0, 0), 1)
-    target.putpixel((1, 1), 2)
-
-    # First run: partial match, no prev snapshot
-    current1 = _paletted_image((4, 4), value=0)
-    current1.putpixel((0, 0), 1)
-
-    original_open_file = PALETTE.open_file
-
-    def aopen_file_mock(path_arg):
-        if ".snapshot." in str(path_arg):
-            return AsyncImage(original_open_file, path_arg)
-        return FakeAsyncImage(target)
-
-    monkeypatch.setattr(PALETTE, "aopen_file", aopen_file_mock)
-
-    stitch_results = iter([current1])
-
-    async def fake_stitch(rect_arg):
-        return next(stitch_results)
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch)
-
-    await proj.run_diff()
-    assert len(await HistoryChange.filter_by_project(proj.info.id)) == 0
-
-    # Second run: progress detected (pixel (1,1) now matches target)
-    current2 = _paletted_image((4, 4), value=0)
-    current2.putpixel((0, 0), 1)
-    current2.putpixel((1, 1), 2)
-
-    stitch_results = iter([current2])
     await proj.run_diff()
 
     changes = await HistoryChange.filter_by_project(proj.info.id)
-    assert len(changes) == 1
-    assert changes[0].progress_pixels == 1
-    assert changes[0].regress_pixels == 0
-
-
-async def test_run_diff_progress_and_regress_tracking(monkeypatch, test_person):
-    """Test progress/regress detection between checks."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
-    proj = await _make_project(rect, test_person.id, touch=True)
-
-    target = _paletted_image((4, 4), value=0)
-    target.putpixel((0, 0), 1)
-    target.putpixel((1, 1), 2)
-
-    current1 = _paletted_image((4, 4), value=0)
-    current1.putpixel((0, 0), 1)
-
-    original_open_file = PALETTE.open_file
-
-    def aopen_file_mock(path_arg):
-        if ".snapshot." in str(path_arg):
-            return AsyncImage(original_open_file, path_arg)
-        return FakeAsyncImage(target)
-
-    monkeypatch.setattr(PALETTE, "aopen_file", aopen_file_mock)
-
-    async def fake_stitch1(rect_arg):
-        return current1
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch1)
-
-    await proj.run_diff()
-    initial_progress = proj.info.total_progress
-
-    current2 = _paletted_image((4, 4), value=0)
-    current2.putpixel((0, 0), 1)
-    current2.putpixel((1, 1), 2)
-
-    async def fake_stitch2(rect_arg):
-        return current2
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch2)
-
-    await proj.run_diff()
-
-    assert proj.info.total_progress == initial_progress + 1
-
-
-async def test_run_diff_regress_detection(monkeypatch, test_person):
-    """Test regress (griefing) detection."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(4, 4))
-    proj = await _make_project(rect, test_person.id, touch=True)
-
-    target = _paletted_image((4, 4), value=0)
-    target.putpixel((0, 0), 1)
-
-    current1 = _paletted_image((4, 4), value=0)
-    current1.putpixel((0, 0), 1)
-
-    monkeypatch.setattr(PALETTE, "aopen_file", lambda path_arg: FakeAsyncImage(target))
-
-    async def fake_stitch1(rect_arg):
-        return current1
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch1)
-
-    await proj.run_diff()
-
-    current2 = _paletted_image((4, 4), value=0)
-    current2.putpixel((0, 0), 7)
-
-    async def fake_stitch2(rect_arg):
-        return current2
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch2)
-
-    await proj.run_diff()
-
-    assert proj.info.total_regress == 1
-    assert proj.info.largest_regress_pixels == 1
+    if progress or regress:
+        assert len(changes) == 1
+        assert changes[0].num_target == 2
+        assert changes[0].progress_pixels == progress
+        assert changes[0].regress_pixels == regress
+    else:
+        assert changes == []
+    assert proj.info.total_progress == progress
+    assert proj.info.total_regress == regress
+    assert proj.info.largest_regress_pixels == regress
 
 
 async def test_run_diff_complete_status(monkeypatch, test_person):
     """Test complete project detection."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2, 2))
-    proj = await _make_project(rect, test_person.id, touch=True)
-
-    target = _paletted_image((2, 2), value=1)
-    current = _paletted_image((2, 2), value=1)
-
-    monkeypatch.setattr(PALETTE, "aopen_file", lambda path_arg: FakeAsyncImage(target))
+    rect = _RECT_2
+    proj = await _make_project(rect, test_person, touch=True)
 
-    async def fake_stitch(rect_arg):
-        return current
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch)
+    _patch_target(monkeypatch, _flat_image((2, 2), 1))
+    monkeypatch.setattr(projects, "stitch_tiles", _stitch_sequence([_flat_image((2, 2), 1)]))
 
     await proj.run_diff()
 
@@ -568,12 +428,10 @@ async def test_run_diff_complete_status(monkeypatch, test_person):
 
 async def test_has_missing_tiles_all_present(setup_config, test_person):
     """Test _has_missing_tiles returns False when all tiles exist."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(1000, 1000))
-    proj = await _make_project(rect, test_person.id, touch=True)
+    rect = _RECT_1K
+    proj = _make_project_nodb(rect, test_person)
 
-    for tile in rect.tiles:
-        tile_file = setup_config.tiles_dir / f"tile-{tile}.png"
-        tile_file.touch()
+    _touch_tiles(setup_config.tiles_dir, rect)
 
     assert proj._has_missing_tiles() is False
 
@@ -581,37 +439,36 @@ async def test_has_missing_tiles_all_present(setup_config, test_person):
 async def test_has_missing_tiles_some_missing(setup_config, test_person):
     """Test _has_missing_tiles returns True when some tiles are missing."""
     rect = Rectangle.from_point_size(Point(0, 0), Size(1000, 2000))
-    proj = await _make_project(rect, test_person.id, touch=True)
+    proj = _make_project_nodb(rect, test_person)
 
     tile_file = setup_config.tiles_dir / "tile-0_0.png"
-    tile_file.touch()
+    _fast_touch(tile_file)
 
     assert proj._has_missing_tiles() is True
 
 
 async def test_has_missing_tiles_all_missing(setup_config, test_person):
     """Test _has_missing_tiles returns True when all tiles are missing."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(1000, 1000))
-    proj = await _make_project(rect, test_person.id, touch=True)
+    rect = _RECT_1K
+    proj = _make_project_nodb(rect, test_person)
 
     assert proj._has_missing_tiles() is True
 
 
 async def test_run_diff_sets_has_missing_tiles(monkeypatch, setup_config, test_person):
     """Test run_diff properly sets has_missing_tiles flag."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(10, 10))
-    proj = await _make_project(rect, test_person.id)
+    rect = _RECT_10
+    proj = await _make_project(rect, test_person)
 
-    async def fake_stitch(rect):
-        return _paletted_image((10, 10), 0)
-
-    monkeypatch.setattr(projects, "stitch_tiles", fake_stitch)
+    monkeypatch.setattr(
+        projects, "stitch_tiles", _stitch_sequence([_flat_image((10, 10), 0), _flat_image((10, 10), 0)])
+    )
 
     await proj.run_diff()
     assert proj.info.has_missing_tiles is True
 
     tile_file = setup_config.tiles_dir / "tile-0_0.png"
-    tile_file.touch()
+    _fast_touch(tile_file)
 
     await proj.run_diff()
     assert proj.info.has_missing_tiles is False
@@ -622,9 +479,8 @@ async def test_run_diff_sets_has_missing_tiles(monkeypatch, setup_config, test_p
 
 async def test_count_cached_tiles_all_present(setup_config):
     """All tiles exist in cache."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2000, 1000))
-    for tile in rect.tiles:
-        (setup_config.tiles_dir / f"tile-{tile}.png").touch()
+    rect = _RECT_2K_1K
+    _touch_tiles(setup_config.tiles_dir, rect)
 
     cached, total = await projects.count_cached_tiles(rect)
     assert cached == total == 2
@@ -632,8 +488,8 @@ async def test_count_cached_tiles_all_present(setup_config):
 
 async def test_count_cached_tiles_some_present(setup_config):
     """Only one of two tiles exists."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2000, 1000))
-    (setup_config.tiles_dir / "tile-0_0.png").touch()
+    rect = _RECT_2K_1K
+    _fast_touch(setup_config.tiles_dir / "tile-0_0.png")
 
     cached, total = await projects.count_cached_tiles(rect)
     assert cached == 1
@@ -642,7 +498,7 @@ async def test_count_cached_tiles_some_present(setup_config):
 
 async def test_count_cached_tiles_none_present(setup_config):
     """No tiles exist in cache."""
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2000, 1000))
+    rect = _RECT_2K_1K
 
     cached, total = await projects.count_cached_tiles(rect)
     assert cached == 0
@@ -650,33 +506,33 @@ async def test_count_cached_tiles_none_present(setup_config):
 
 
 # --- stitch_tiles ---
-def _paletted_png_bytes(size=(1, 1), data=(0,)):
-    im = PALETTE.new(size)
-    im.putdata(list(data))
-    buf = io.BytesIO()
-    im.save(buf, format="PNG")
-    return buf.getvalue()
+
+
+async def _write_tiles(tiles_dir, blobs):
+    """Write several cache tiles concurrently; blobs maps tile name (e.g. "0_0") to PNG bytes."""
+    await asyncio.gather(
+        *(asyncio.to_thread((tiles_dir / f"tile-{name}.png").write_bytes, png) for name, png in blobs.items())
+    )
 
 
 async def test_stitch_tiles_missing_tile_logs_and_skips(setup_config):
     """Missing cache tiles are skipped with transparent pixels."""
     # Only create one of two needed tiles
-    png_a = _paletted_png_bytes((1000, 1000), [1] * (1000 * 1000))
+    png_a = _paletted_png_bytes((1000, 1000), 1)
     (setup_config.tiles_dir / "tile-0_0.png").write_bytes(png_a)
 
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2000, 1000))
+    rect = _RECT_2K_1K
     stitched = await projects.stitch_tiles(rect)
     assert stitched.size == rect.size
 
 
 async def test_stitch_tiles_pastes_cached_tiles(setup_config):
-    png_a = _paletted_png_bytes((1000, 1000), [1] * (1000 * 1000))
-    png_b = _paletted_png_bytes((1000, 1000), [2] * (1000 * 1000))
-    (setup_config.tiles_dir / "tile-0_0.png").write_bytes(png_a)
-    (setup_config.tiles_dir / "tile-1_0.png").write_bytes(png_b)
+    await _write_tiles(
+        setup_config.tiles_dir,
+        {"0_0": _paletted_png_bytes((1000, 1000), 1), "1_0": _paletted_png_bytes((1000, 1000), 2)},
+    )
 
-    rect = Rectangle.from_point_size(Point(0, 0), Size(2000, 1000))
+    rect = _RECT_2K_1K
     stitched = await projects.stitch_tiles(rect)
     assert stitched.size == rect.size
-    data = stitched.get_flattened_data()
-    assert any(p for p in data)
+    assert any(stitched.tobytes())